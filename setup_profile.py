@@ -1,9 +1,11 @@
-import os
-import zipfile
+import hashlib
+from pathlib import Path
 
 def create_proxy_auth_extension_dir(proxy_host, proxy_port, proxy_username, proxy_password, dir_path="proxy_auth_plugin"):
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
+    ext_dir = Path(dir_path)
+    ext_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = ext_dir / "manifest.json"
+    background_path = ext_dir / "background.js"
 
     manifest_json = """{
         "version": "1.0.0",
@@ -46,10 +48,17 @@ def create_proxy_auth_extension_dir(proxy_host, proxy_port, proxy_username, prox
     );
     """
 
-    with open(os.path.join(dir_path, "manifest.json"), "w") as f:
-        f.write(manifest_json)
-    with open(os.path.join(dir_path, "background.js"), "w") as f:
-        f.write(background_js)
+    # Skip rewriting the extension when its generated files haven't changed,
+    # so Chrome can keep using its cached copy of the extension
+    sig_path = ext_dir / ".sig"
+    signature = hashlib.sha1(f"{manifest_json}\0{background_js}".encode()).hexdigest()
+    if (sig_path.exists() and manifest_path.exists() and background_path.exists()
+            and sig_path.read_text().strip() == signature):
+        return
+
+    manifest_path.write_text(manifest_json)
+    background_path.write_text(background_js)
+    sig_path.write_text(signature)
 
 
 from seleniumbase import SB
@@ -6,15 +6,19 @@ in parallel, with smart window positioning, error handling, and retry mechanisms
 """
 
 import os
-import json
+import mmap
 import time
+import queue
 import random
 import logging
-import traceback
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+from collections import deque
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import orjson
 from seleniumbase import SB
 from screeninfo import get_monitors
 from utils.helpers import get_cookies
@@ -23,6 +27,48 @@ from logs.custom_logging import setup_logging
 # Configure logging
 logger = setup_logging(console_level=logging.DEBUG)
 
+# Evaluates every probe in the page in one round-trip. Each probe is [css_selector, required_text]
+# and resolves to true when any matching element is rendered (and contains the text, if any).
+# Text is compared here because CSS selectors can't match on text content.
+# A probe of [css_selector, prefix, attribute] instead reads that attribute (or the text) of the
+# first matching element once and checks that it starts with the prefix.
+PAGE_PROBE_JS = """
+return (function (probes) {
+    const isVisible = (node) => !!(node.offsetWidth || node.offsetHeight || node.getClientRects().length);
+    const result = {};
+    for (const key in probes) {
+        const [selector, text, attribute] = probes[key];
+        if (attribute) {
+            const node = document.querySelector(selector);
+            const value = node ? (node.getAttribute(attribute) || node.textContent || '') : '';
+            result[key] = value.trim().startsWith(text);
+            continue;
+        }
+        result[key] = Array.prototype.some.call(
+            document.querySelectorAll(selector),
+            (node) => isVisible(node) && (!text || (node.innerText || node.textContent || '').includes(text))
+        );
+    }
+    return result;
+})(arguments[0]);
+"""
+
+# Returns the page's body text only when it is shorter than arguments[0] characters, else null.
+SHORT_BODY_TEXT_JS = """
+const text = document.body ? document.body.innerText : '';
+return text.length < arguments[0] ? text : null;
+"""
+
+
+def load_json_file(path: str) -> Any:
+    """Parse a JSON file straight from a read-only memory map, without copying it into Python first."""
+    with open(path, 'rb') as f:
+        # mmap can't map an empty file; let orjson raise its usual decode error instead
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
 
 class WalmartBot:
     """
@@ -37,24 +83,55 @@ class WalmartBot:
     - Result tracking and storage
     """
     
-    def __init__(self, max_workers: int = 30, retry_attempts: int = 1):
+    def __init__(self, max_workers: int = 30, retry_attempts: int = 1, lightweight_browsers: bool = True):
         """
         Initialize the WalmartBot.
         
         Args:
             max_workers: Maximum number of concurrent worker threads
             retry_attempts: Number of times to retry adding a product to cart
+            lightweight_browsers: Block images and cap renderer processes to cut per-browser memory
         """
         self.logger = logger
-        self.add_to_cart_button_xpath = './/div[contains(@data-testid, "add-to-cart-section")]//button[contains(@aria-label, "Add to cart")][1]'
+        self.lightweight_browsers = lightweight_browsers
+        self.add_to_cart_button_css = 'div[data-testid*="add-to-cart-section"] button[aria-label*="Add to cart"]'
         self.max_workers = max_workers
         self.retry_attempts = retry_attempts
 
+        # Page state checks batched into a single execute_script call per probe
+        account_link_css = 'a[link-identifier="Account"]'
+        header_sign_in_css = 'div[data-automation-id="headerSignIn"]'
+        self.page_probes = {
+            'logged_in_link': [account_link_css, 'Hi, ', 'aria-label'],
+            'logged_in_header': [header_sign_in_css, 'Hi, '],
+            'sign_in_link': [account_link_css, 'Sign In, ', 'aria-label'],
+            'sign_in_header': [header_sign_in_css, 'Sign In, '],
+            'captcha_h1': ['h1', 'Robot or human?'],
+            'captcha_h2': ['h2', 'Robot or human?'],
+            'add_to_cart_button': [self.add_to_cart_button_css, None],
+            'added_message': ['h1', 'Added to cart!'],
+            'view_cart_button': ['button', 'View cart'],
+        }
+
         # Configure window positioning
         self._configure_window_settings()
-        
-        # Track used positions for window placement
-        self.used_positions = set()
+
+        # Results are buffered in memory and written once at the end of a run; a single writer
+        # thread also journals them as JSONL so a crashed run can be recovered on the next start
+        self.output_dir = 'data/output_data'
+        self._results: Dict[bool, Dict[str, Any]] = {True: {}, False: {}}
+        self._writer_q: "queue.Queue[Optional[Tuple[bool, Dict[str, Any]]]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        # One lock per results file so buffering, journal appends and compaction never interleave
+        self._save_locks = {'success': threading.Lock(), 'failure': threading.Lock()}
+
+        # Long-lived browsers reused across products, one per worker slot
+        self.base_url = "https://www.walmart.com"
+        # Cookies are loaded and converted to CDP params once, then injected in one call per browser
+        self._cdp_cookies = [self._to_cdp_cookie(cookie) for cookie in get_cookies()]
+        self._browser_pool: Optional["queue.Queue[Any]"] = None
+        self._browser_contexts: Dict[int, Any] = {}
+        self._browser_lock = threading.Lock()
 
     def _configure_window_settings(self):
         """Configure the window settings based on the screen size."""
@@ -73,106 +150,354 @@ class WalmartBot:
         self.WINDOW_HEIGHT = 400
         self.WINDOW_PADDING = 10  # Space between windows
 
+        self._reset_window_slots()
+
+    def _reset_window_slots(self):
+        """Precompute the non-overlapping grid positions and mark them all as free."""
+        screen_height = self.SCREEN_HEIGHT - 80
+        cols = max(1, self.SCREEN_WIDTH // (self.WINDOW_WIDTH + self.WINDOW_PADDING))
+        rows = max(1, screen_height // (self.WINDOW_HEIGHT + self.WINDOW_PADDING))
+        slots = [
+            (col * (self.WINDOW_WIDTH + self.WINDOW_PADDING), row * (self.WINDOW_HEIGHT + self.WINDOW_PADDING))
+            for row in range(rows)
+            for col in range(cols)
+        ]
+        self._grid_slots = frozenset(slots)
+        self._free_slots = deque(slots)
+
     def get_smart_random_position(self, index: int) -> Tuple[int, int]:
         """
         Get a window position that avoids overlapping with other windows.
         
         Args:
-            index: The index of the browser window
+            index: The index of the browser window (free grid slots are handed out in order)
             
         Returns:
             A tuple of (x, y) coordinates for window placement
         """
-        screen_height = self.SCREEN_HEIGHT - 80
-        cols = max(1, self.SCREEN_WIDTH // (self.WINDOW_WIDTH + self.WINDOW_PADDING))
-        rows = max(1, screen_height // (self.WINDOW_HEIGHT + self.WINDOW_PADDING))
-        max_slots = cols * rows
-
-        # Use grid positioning for first set of windows
-        if index < max_slots:
-            row = index // cols
-            col = index % cols
-            x = col * (self.WINDOW_WIDTH + self.WINDOW_PADDING)
-            y = row * (self.WINDOW_HEIGHT + self.WINDOW_PADDING)
-        else:
-            # For additional windows, find a random position that's not already used
-            for _ in range(50):  # Try up to 50 times to find an unused position
-                x = random.randint(50, self.SCREEN_WIDTH - self.WINDOW_WIDTH - 50)
-                y = random.randint(50, screen_height - self.WINDOW_HEIGHT - 50)
-                
-                # Check if position is sufficiently far from existing windows
-                if all((abs(x - pos_x) > 50 or abs(y - pos_y) > 50) 
-                       for pos_x, pos_y in self.used_positions):
-                    break
-            
-        self.used_positions.add((x, y))
-        return x, y
+        try:
+            return self._free_slots.popleft()
+        except IndexError:
+            # Every grid slot is taken, so fall back to a random position
+            screen_height = self.SCREEN_HEIGHT - 80
+            x = random.randint(50, max(50, self.SCREEN_WIDTH - self.WINDOW_WIDTH - 50))
+            y = random.randint(50, max(50, screen_height - self.WINDOW_HEIGHT - 50))
+            return x, y
+
+    def release_position(self, position: Tuple[int, int]):
+        """
+        Return a window position to the free grid slots once its window closes.
+
+        Args:
+            position: The (x, y) coordinates previously returned by get_smart_random_position
+        """
+        if position in self._grid_slots:
+            self._free_slots.append(position)
     
+    def _result_paths(self, is_success: bool) -> Tuple[str, str]:
+        """
+        Get the JSON and JSONL journal paths for success or failure results.
+
+        Args:
+            is_success: True for the success files, False for the failure files
+
+        Returns:
+            A tuple of (json_path, jsonl_path)
+        """
+        base_name = 'added_to_carts_successful_products' if is_success else 'failed_to_add_products'
+        base_path = os.path.join(self.output_dir, base_name)
+        return f"{base_path}.json", f"{base_path}.jsonl"
+
+    def _result_writer_loop(self):
+        """Append queued results to the JSONL journals until a None sentinel is received."""
+        files = {
+            is_success: open(self._result_paths(is_success)[1], 'ab', buffering=1 << 16)
+            for is_success in (True, False)
+        }
+        try:
+            while True:
+                item = self._writer_q.get()
+                if item is None:
+                    break
+
+                is_success, product = item
+                with self._save_locks['success' if is_success else 'failure']:
+                    files[is_success].write(orjson.dumps(product) + b'\n')
+
+                # Flush once the backlog is drained so a crash loses as little as possible
+                if self._writer_q.empty():
+                    for f in files.values():
+                        f.flush()
+        finally:
+            for f in files.values():
+                f.close()
+
+    def _start_result_writer(self):
+        """Start the background thread that journals results to disk."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._writer_thread = threading.Thread(target=self._result_writer_loop, name="result-writer", daemon=True)
+        self._writer_thread.start()
+
+    def _stop_result_writer(self):
+        """Drain and stop the writer thread, then write the buffered results to the JSON files."""
+        if self._writer_thread is not None:
+            self._writer_q.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+        self._flush_results()
+
+    def _flush_results(self):
+        """Write this run's buffered results into the JSON result files in one go and drop the journals."""
+        for is_success in (True, False):
+            with self._save_locks['success' if is_success else 'failure']:
+                results = self._results[is_success]
+                if results:
+                    self._merge_into_result_file(is_success, results)
+                    self._results[is_success] = {}
+
+                # The journal only mirrors what was just written
+                journal_path = self._result_paths(is_success)[1]
+                if os.path.exists(journal_path):
+                    os.remove(journal_path)
+
+    def _compact_results(self):
+        """Merge any JSONL journal entries into the JSON result files and remove the journals."""
+        for is_success in (True, False):
+            with self._save_locks['success' if is_success else 'failure']:
+                self._compact_result_file(is_success)
+
+    def _compact_result_file(self, is_success: bool):
+        """Merge one JSONL journal into its JSON result file. Caller must hold the file's lock."""
+        journal_path = self._result_paths(is_success)[1]
+        if not os.path.exists(journal_path):
+            return
+
+        # Replay the journal in order; a torn last line from a crash is skipped
+        entries: Dict[str, Any] = {}
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    entries.update(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    self.logger.warning(f"Skipping unreadable line in {journal_path}")
+
+        self._merge_into_result_file(is_success, entries)
+        os.remove(journal_path)
+
+    def _merge_into_result_file(self, is_success: bool, entries: Dict[str, Any]):
+        """Update a JSON result file with new entries in a single write. Caller must hold the file's lock."""
+        file_path = self._result_paths(is_success)[0]
+
+        # Load existing data
+        if os.path.exists(file_path):
+            try:
+                data = load_json_file(file_path)
+            except orjson.JSONDecodeError:
+                data = {}
+        else:
+            data = {}
+
+        data.update(entries)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
     def save_product_data(self, product: Dict[str, Any], is_success: bool):
         """
-        Save product data to success or failure file.
+        Buffer product data for the success or failure file and queue it for the journal.
         
         Args:
             product: Dictionary containing product information
             is_success: True if the product was added successfully, False otherwise
         """
-        file_dir = 'data/output_data'
-        os.makedirs(file_dir, exist_ok=True)
+        if self._writer_thread is not None:
+            with self._save_locks['success' if is_success else 'failure']:
+                self._results[is_success].update(product)
+            self._writer_q.put((is_success, product))
+            return
+
+        # No run in progress: write through synchronously, guarded by the file's lock
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._save_locks['success' if is_success else 'failure']:
+            with open(self._result_paths(is_success)[1], 'ab') as f:
+                f.write(orjson.dumps(product) + b'\n')
+            self._compact_result_file(is_success)
+
+    @contextmanager
+    def _open_browser(self, proxy_needed: bool, window_index: int) -> Iterator[Any]:
+        """
+        Launch a browser, position its window and apply the account cookies.
 
-        # Decide filename based on success/failure
-        file_name = 'added_to_carts_successful_products.json' if is_success else 'failed_to_add_products.json'
-        file_path = os.path.join(file_dir, file_name)
+        Args:
+            proxy_needed: Whether to launch with the proxy profile and extension
+            window_index: Index for window positioning
 
-        # Load existing data
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    data = {}
+        Yields:
+            The SeleniumBase browser instance
+        """
+        # Determine profile path
+        if proxy_needed:
+            profile = r'D:\Web Scraping\Client Projects\Dereal\Project1 (Walmart Bot)\new source code\profiles\sb_with_proxy'
         else:
-            data = {}
+            profile = r'D:\Web Scraping\Client Projects\Dereal\Project1 (Walmart Bot)\new source code\profiles\sb_without_proxy'
+
+        # Many browsers run side by side, so keep each one's renderer footprint small
+        chromium_args = []
+        if proxy_needed:
+            chromium_args.append('--ignore-certificate-errors')
+        if self.lightweight_browsers:
+            chromium_args.append('--renderer-process-limit=2')
+
+        with SB(
+                uc=True, 
+                user_data_dir=profile,
+                extension_dir="proxy_auth_plugin" if proxy_needed else None,
+                chromium_arg=','.join(chromium_args) or None,
+                block_images=self.lightweight_browsers,
+                ) as browser:
+            
+            # Configure browser window
+            position = self.get_smart_random_position(window_index)
+            try:
+                x, y = position
+                browser.set_window_size(self.WINDOW_WIDTH, self.WINDOW_HEIGHT)
+                browser.set_window_position(x, y)
+
+                # Set cookies over CDP before the first navigation so no reload is needed
+                browser.execute_cdp_cmd("Network.setCookies", {"cookies": self._cdp_cookies})
+
+                yield browser
+            finally:
+                self.release_position(position)
+
+    def _to_cdp_cookie(self, cookie: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a name/value cookie into CDP Network.setCookie params scoped to Walmart."""
+        return {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": ".walmart.com",
+            "path": "/",
+            "secure": True,
+        }
+
+    def _acquire_pooled_browser(self, window_index: int) -> Any:
+        """Take an idle browser from the pool, launching a new one if none is idle."""
+        try:
+            return self._browser_pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Each worker thread holds at most one browser, so the pool never exceeds max_workers
+        browser_context = self._open_browser(False, window_index)
+        browser = browser_context.__enter__()
+        with self._browser_lock:
+            self._browser_contexts[id(browser)] = browser_context
+        return browser
+
+    def _discard_browser(self, browser: Any):
+        """Shut down a pooled browser and forget it."""
+        with self._browser_lock:
+            browser_context = self._browser_contexts.pop(id(browser), None)
+        if browser_context is None:
+            return
+        try:
+            browser_context.__exit__(None, None, None)
+        except Exception as e:
+            self.logger.error("Error closing browser: %s", e)
+            self.logger.debug("Traceback:", exc_info=True)
+
+    def _close_browser_pool(self):
+        """Shut down every browser that was launched for the pool."""
+        self._browser_pool = None
+        with self._browser_lock:
+            browser_contexts = list(self._browser_contexts.values())
+            self._browser_contexts = {}
+        for browser_context in browser_contexts:
+            try:
+                browser_context.__exit__(None, None, None)
+            except Exception as e:
+                self.logger.error("Error closing browser: %s", e)
+                self.logger.debug("Traceback:", exc_info=True)
+
+    @contextmanager
+    def _checkout_browser(self, proxy_needed: bool, window_index: int) -> Iterator[Any]:
+        """
+        Borrow a browser for one attempt.
+
+        Pooled browsers are returned for reuse afterwards, or discarded if the attempt
+        raised. Proxy attempts (and calls made outside add_products_to_cart) get a
+        dedicated browser that is closed when the attempt ends.
+
+        Args:
+            proxy_needed: Whether the attempt must go through the proxy
+            window_index: Index for window positioning
 
-        # Update and save
-        data.update(product)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        Yields:
+            The SeleniumBase browser instance
+        """
+        if proxy_needed or self._browser_pool is None:
+            with self._open_browser(proxy_needed, window_index) as browser:
+                yield browser
+            return
 
-    def is_request_blocked(self, browser) -> bool:
+        browser = self._acquire_pooled_browser(window_index)
+        try:
+            yield browser
+        except BaseException:
+            self._discard_browser(browser)
+            raise
+        else:
+            self._browser_pool.put(browser)
+
+    def probe_page(self, browser) -> Dict[str, bool]:
+        """
+        Evaluate all page state probes in the browser with a single script call.
+
+        Args:
+            browser: The SeleniumBase browser instance
+
+        Returns:
+            Dictionary mapping each probe name in self.page_probes to its visibility
+        """
+        return browser.execute_script(PAGE_PROBE_JS, self.page_probes) or {}
+
+    def is_request_blocked(self, browser, state: Optional[Dict[str, bool]] = None) -> bool:
         """
         Check if a request is blocked by a captcha or other form of protection.
 
         Args:
             browser: The SeleniumBase browser instance
+            state: Result of probe_page for the current page (probed if not given)
 
         Returns:
             True if a captcha or other form of protection is detected, False otherwise
         """
         try:
-            body = browser.get_text('body')
+            state = state if state is not None else self.probe_page(browser)
 
             # Check for captcha elements
-            if (browser.is_element_visible('.//h1[contains(text(), "Robot or human?")]') or
-                browser.is_element_visible('.//h2[contains(text(), "Robot or human?")]')):
+            if state.get('captcha_h1') or state.get('captcha_h2'):
                 self.logger.warning("Captcha detected!")
                 return True
-            elif body and len(body) < 500 and 'Forbidden' in body:
+
+            # Only a short error page is worth pulling back; real pages stay in the browser
+            body = browser.execute_script(SHORT_BODY_TEXT_JS, 500)
+            if body and 'Forbidden' in body:
                 self.logger.warning("Forbidden access detected!")
                 return True
-            else:
-                return False
+            return False
 
         except Exception as e:
-            self.logger.error(f"Error checking for captcha or other protection: {e}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.error("Error checking for captcha or other protection: %s", e)
+            self.logger.debug("Traceback:", exc_info=True)
             return False
     
-    def is_account_logged_in(self, browser) -> Tuple[Optional[bool], bool]:
+    def is_account_logged_in(self, browser, state: Optional[Dict[str, bool]] = None) -> Tuple[Optional[bool], bool]:
         """
         Check if user is logged into Walmart account.
 
         Args:
             browser: The SeleniumBase browser instance
+            state: Result of probe_page for the current page (probed if not given)
 
         Returns:
             Tuple of (is_logged_in, is_captcha_detected) where:
@@ -180,21 +505,18 @@ class WalmartBot:
             - is_captcha_detected: True if captcha detected, False otherwise
         """
         try:
-            a_tag_selector = './/a[@link-identifier="Account"]'
-            inside_div_selector = './/div[@data-automation-id="headerSignIn"]'
+            state = state if state is not None else self.probe_page(browser)
             
             # If any of these elements are visible, we have logged in successfully
-            if (browser.is_text_visible('Hi, ', a_tag_selector, by='xpath') or 
-                browser.is_text_visible('Hi, ', inside_div_selector, by='xpath')):
+            if state.get('logged_in_link') or state.get('logged_in_header'):
                 self.logger.debug("Logged in successfully!")
                 return True, False
                 
-            elif (browser.is_text_visible('Sign In, ', a_tag_selector, by='xpath') or 
-                browser.is_text_visible('Sign In, ', inside_div_selector, by='xpath')):
+            elif state.get('sign_in_link') or state.get('sign_in_header'):
                 self.logger.debug("Not logged in!")
                 return False, False
 
-            elif self.is_request_blocked(browser):
+            elif self.is_request_blocked(browser, state):
                 self.logger.debug("Request blocked!")
                 return False, True
 
@@ -202,56 +524,74 @@ class WalmartBot:
                 return True, None
             
         except Exception as e:
-            self.logger.error(f"Error checking login status: {e}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.error("Error checking login status: %s", e)
+            self.logger.debug("Traceback:", exc_info=True)
             return None, None
     
-    def is_add_to_cart_button_visible(self, browser) -> bool:
+    def is_add_to_cart_button_visible(self, browser, state: Optional[Dict[str, bool]] = None) -> bool:
         """
         Check if the Add to Cart button is visible on the page.
         
         Args:
             browser: The SeleniumBase browser instance
+            state: Result of probe_page for the current page (probed if not given)
             
         Returns:
             True if the button is visible, False otherwise
         """
         try:
-            if browser.is_element_visible(self.add_to_cart_button_xpath):
+            state = state if state is not None else self.probe_page(browser)
+            if state.get('add_to_cart_button'):
                 self.logger.info("Add to cart Button is visible!")
                 return True
             return False
         except Exception as e:
-            self.logger.error(f"Error checking Add to Cart button visibility: {e}")
+            self.logger.error("Error checking Add to Cart button visibility: %s", e)
             return False
 
-    def is_item_added_to_cart(self, browser) -> bool:
+    def is_item_added_to_cart(self, browser, state: Optional[Dict[str, bool]] = None) -> bool:
         """
         Check if the item was successfully added to cart.
         
         Args:
             browser: The SeleniumBase browser instance
+            state: Result of probe_page for the current page (probed if not given)
             
         Returns:
             True if the item appears to be added to cart, False otherwise
         """
         try:
-            # Check if "Added to cart" message appears
-            added_message_xpath = './/h1[contains(text(), "Added to cart!")]'
-            
-            # Check if View Cart button appears
-            view_cart_xpath = './/button[contains(text(), "View cart")]'
-            
-            # If any of these elements are visible, item was likely added successfully
-            if (browser.is_element_visible(added_message_xpath) or 
-                browser.is_element_visible(view_cart_xpath)):
+            state = state if state is not None else self.probe_page(browser)
+
+            # If the "Added to cart" message or View Cart button is visible, item was likely added successfully
+            if state.get('added_message') or state.get('view_cart_button'):
                 return True
                 
             return False
         except Exception as e:
-            self.logger.error(f"Error checking if item was added to cart: {e}")
+            self.logger.error("Error checking if item was added to cart: %s", e)
             return False
         
+    def wait_for_item_added_to_cart(self, browser, timeout: float = 10, interval: float = 0.1) -> bool:
+        """
+        Poll until the item shows as added to cart or the timeout expires.
+
+        Args:
+            browser: The SeleniumBase browser instance
+            timeout: Maximum number of seconds to wait
+            interval: Seconds between probes
+
+        Returns:
+            True if the item was added to cart within the timeout, False otherwise
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.is_item_added_to_cart(browser):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
     def attempt_add_to_cart(self, product_info: Dict, category_key: str, window_index: int = 0) -> bool:
         """
         Attempt to add a product to cart.
@@ -274,49 +614,27 @@ class WalmartBot:
         
         while retries < self.retry_attempts:
             try:
-                # Determine profile path
-                if proxy_needed:
-                    profile = r'D:\Web Scraping\Client Projects\Dereal\Project1 (Walmart Bot)\new source code\profiles\sb_with_proxy'
-                else:
-                    profile = r'D:\Web Scraping\Client Projects\Dereal\Project1 (Walmart Bot)\new source code\profiles\sb_without_proxy'
-
-                with SB(
-                        uc=True, 
-                        user_data_dir=profile,
-                        extension_dir="proxy_auth_plugin" if proxy_needed else None,
-                        chromium_arg='--ignore-certificate-errors' if proxy_needed else None,
-                        ) as browser:
-                    
-                    # Configure browser window
-                    x, y = self.get_smart_random_position(window_index)
-
-                    browser.set_window_size(self.WINDOW_WIDTH, self.WINDOW_HEIGHT)
-                    browser.set_window_position(x, y)
+                with self._checkout_browser(proxy_needed, window_index) as browser:
 
+                    # Cookies were applied when the browser was launched
                     browser.open(product_url)
-                    # Add cookies and navigate to product page
-                    cookie_list = get_cookies()
-                    for cookie in cookie_list:
-                        browser.add_cookie(cookie)
-
-                    browser.sleep(2)
-                    browser.refresh()
                     
                     # Wait for page to load
                     try:
                         browser.wait_for_element_visible(
-                            './/body',
+                            'body',
                             timeout=180 if proxy_needed else 40
                         )
                     except Exception as e:
-                        self.logger.error(f"Error waiting for page to load: {e}")
-                        self.logger.debug(traceback.format_exc())
+                        self.logger.error("Error waiting for page to load: %s", e)
+                        self.logger.debug("Traceback:", exc_info=True)
                         retries += 1
                         self.logger.warning(f"Retrying '{category_key}'... {retries}/{self.retry_attempts}")
                         continue
                     
                     # Check login status and for captcha
-                    is_logged_in, captcha_detected = self.is_account_logged_in(browser)
+                    page_state = self.probe_page(browser)
+                    is_logged_in, captcha_detected = self.is_account_logged_in(browser, page_state)
                     
                     if captcha_detected:
                         self.logger.warning("Captcha detected, switching to proxy")
@@ -327,22 +645,23 @@ class WalmartBot:
                     
                     if is_logged_in:
                         # Check for Add to Cart button
-                        if self.is_add_to_cart_button_visible(browser):
+                        if self.is_add_to_cart_button_visible(browser, page_state):
                             try:
                                 # Click Add to Cart button
-                                button = browser.wait_for_element_visible(self.add_to_cart_button_xpath, timeout=30)
+                                button = browser.wait_for_element_visible(
+                                    self.add_to_cart_button_css, by='css selector', timeout=30
+                                )
                                 button.click()
-                                time.sleep(4)  # Wait for cart update
                                 
-                                # Check if item was added to cart
-                                if self.is_item_added_to_cart(browser):
+                                # Poll for the cart confirmation instead of sleeping a fixed time
+                                if self.wait_for_item_added_to_cart(browser, timeout=10):
                                     return True
                                 else:
                                     self.logger.warning(f"Failed to add to cart item for: '{category_key}'")
                             except Exception as e:
-                                self.logger.error(f"Error clicking Add to Cart button: {e}")
+                                self.logger.error("Error clicking Add to Cart button: %s", e)
                         else:
-                            already_added = self.is_item_added_to_cart(browser)
+                            already_added = self.is_item_added_to_cart(browser, page_state)
                             if already_added:
                                 self.logger.info('Item already added to cart!, Skipping...')
                                 return True
@@ -352,13 +671,13 @@ class WalmartBot:
                         self.logger.warning("Not logged in to account")
                         
             except Exception as e:
-                self.logger.error(f"Error in browser session: {e}")
-                self.logger.debug(traceback.format_exc())
+                self.logger.error("Error in browser session: %s", e)
+                self.logger.debug("Traceback:", exc_info=True)
             
             retries += 1
             self.logger.warning(f"Retrying '{category_key}'... {retries}/{self.retry_attempts}")
         
-        self.logger.error(f"❌ Failed to add to cart after {self.retry_attempts} attempts: '{category_key}'")
+        self.logger.error("❌ Failed to add to cart after %s attempts: '%s'", self.retry_attempts, category_key)
         return False
         
     def process_product(self, item_key: str, item_info: Dict[str, Any], window_index: int) -> Optional[Dict]:
@@ -373,12 +692,17 @@ class WalmartBot:
         Returns:
             Updated product data if successful, None otherwise
         """
+        eligible_products = item_info.get('eligible_products') or []
+        # Files scraped before the tuple fix wrap the list one level deeper: [[...]]
+        if eligible_products and isinstance(eligible_products[0], list):
+            eligible_products = eligible_products[0]
+
         # Check if there are eligible products
-        if not item_info.get('eligible_products') or not item_info['eligible_products'][0]:
-            self.logger.error(f"No eligible products found for '{item_key}'")
+        if not eligible_products:
+            self.logger.error("No eligible products found for '%s'", item_key)
             return None
             
-        products_list = item_info['eligible_products'][0].copy()  # Make a copy to avoid modifying original
+        products_list = list(eligible_products)  # Make a copy to avoid modifying original
 
         # Try to add products to cart in order (cheapest first)
         for i, eligible_product in enumerate(products_list):
@@ -430,19 +754,27 @@ class WalmartBot:
         Args:
             products_data: Dictionary with product categories as keys and product information as values
         """
-        # Reset used positions for window placement
-        self.used_positions = set()
+        # Reset free positions for window placement
+        self._reset_window_slots()
         
-        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(products_data))) as executor:
-            futures = []
-            for idx, (item_key, item_info) in enumerate(products_data.items()):
-                futures.append(
-                    executor.submit(self.add_to_cart_single_product, item_key, item_info, idx)
-                )
-            
-            # Wait for all tasks to complete
-            for future in futures:
-                future.result()
+        # Recover journals left behind by an interrupted run before starting a new one
+        self._compact_results()
+        self._start_result_writer()
+        self._browser_pool = queue.Queue()
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(products_data))) as executor:
+                futures = []
+                for idx, (item_key, item_info) in enumerate(products_data.items()):
+                    futures.append(
+                        executor.submit(self.add_to_cart_single_product, item_key, item_info, idx)
+                    )
+                
+                # Wait for all tasks to complete
+                for future in futures:
+                    future.result()
+        finally:
+            self._close_browser_pool()
+            self._stop_result_writer()
         
         self.logger.info("✅ All product processing complete!")
 
@@ -455,10 +787,9 @@ def main():
     """
     # Load product data from file
     try:
-        with open('data/output_data/scraped_products.json', encoding='utf-8') as f:
-            products_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-       logger.error(f'Failed to load data from file!: {e}')
+        products_data = load_json_file('data/output_data/scraped_products.json')
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+       logger.error('Failed to load data from file!: %s', e)
 
 
     # Initialize and run bot
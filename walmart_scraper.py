@@ -1,30 +1,77 @@
-from utils.helpers import HtmlPageScraper, HtmlParser
+from utils.helpers import HtmlPageScraper, parse_search_pages
 from logs.custom_logging import setup_logging
 import logging
 import asyncio
-import traceback
+import functools
 import json
 from typing import List, Dict, Optional, Any
-import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from aiolimiter import AsyncLimiter
 
 logger = setup_logging(console_level=logging.DEBUG)
 
+
+@functools.lru_cache(maxsize=8192)
+def _safe_float(value: str) -> float:
+    """Convert a price string to float, returning NaN when it cannot be parsed (memoized)."""
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
 class MyFastScraper:
-    def __init__(self, input_items_info: List[Dict[str, Any]], batch_size: int = 100):
+    def __init__(self, input_items_info: List[Dict[str, Any]], batch_size: int = 100,
+                 queries_per_second: Optional[float] = None, parser_workers: Optional[int] = None):
         """
         Initialize the scraper with input items and configuration.
         
         Args:
             input_items_info: List of product dictionaries with product_name, min_price, max_price
-            batch_size: Number of items to process in each batch
-            max_retries: Maximum number of retry attempts for failed requests
+            batch_size: Maximum number of queries being scraped at the same time
+            queries_per_second: Rate at which new queries are started (defaults to batch_size every 2 seconds)
+            parser_workers: Number of processes parsing pages (defaults to the CPU count)
         """
         self.html_page_scraper = HtmlPageScraper()
-        self.html_parser = HtmlParser()
+        self.parser_workers = parser_workers
+        self._parser_pool: Optional[ProcessPoolExecutor] = None
+        # Nesting depth of `async with self`; resources are released only by the outermost exit
+        self._entered = 0
         self.input_items_info = input_items_info
         self.logger = logger
         self.batch_size = batch_size
+        self.queries_per_second = queries_per_second
         
+    def _get_parser_pool(self) -> ProcessPoolExecutor:
+        """Create the parser process pool on first use."""
+        if self._parser_pool is None:
+            self._parser_pool = ProcessPoolExecutor(max_workers=self.parser_workers)
+        return self._parser_pool
+
+    def _close_parser_pool(self) -> None:
+        """Shut down the parser process pool if it was started."""
+        if self._parser_pool is not None:
+            self._parser_pool.shutdown()
+            self._parser_pool = None
+
+    async def __aenter__(self) -> "MyFastScraper":
+        """Open the shared HTTP session used by every page request."""
+        if self._entered == 0:
+            await self.html_page_scraper.__aenter__()
+        self._entered += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the shared HTTP session and the parser pool once the outermost block exits."""
+        self._entered -= 1
+        if self._entered > 0:
+            return
+        try:
+            await self.html_page_scraper.__aexit__(exc_type, exc, tb)
+        finally:
+            self._close_parser_pool()
+
     async def scrape_products(self, query: str) -> List[Dict[str, Any]]:
         """
         Scrape product information for a given search query.
@@ -36,34 +83,37 @@ class MyFastScraper:
             List of parsed product dictionaries
         """
         try:
-            # Create tasks for fetching multiple pages
-            tasks = []
+            # Build request params for multiple pages
+            params_list = []
             for page in range(1, 3):  # Fetch first 2 pages
                 params = {
                     "q": query,
                     "page": page,
                 }
-                tasks.append(self.html_page_scraper.request_html(params))
+                params_list.append(params)
                 
             # Wait for all page HTML content to be fetched
-            html_contents = await asyncio.gather(*tasks)
+            html_contents = await self.html_page_scraper.request_many(params_list)
             
             # Filter out None values (failed requests)
             valid_html_contents = [html for html in html_contents if html]
             
             if not valid_html_contents:
-                self.logger.error(f"⚠️ No valid HTML content found for query: {query}")
+                self.logger.error("⚠️ No valid HTML content found for query: %s", query)
                 return []
                 
-            # Parse the HTML content to extract product information
-            raw_parsed_products = self.html_parser.search_page_parser(valid_html_contents, query)
+            # Parse the HTML content in a worker process so the event loop keeps issuing requests
+            loop = asyncio.get_running_loop()
+            raw_parsed_products = await loop.run_in_executor(
+                self._get_parser_pool(), parse_search_pages, valid_html_contents, query
+            )
             self.logger.info(f"✅ Found {len(raw_parsed_products)} products for query: '{query}'")
             
             return raw_parsed_products
             
         except Exception as e:
-            self.logger.error(f"❌ Error during scrape_products for {query}: {e}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.error("❌ Error during scrape_products for %s: %s", query, e)
+            self.logger.debug("Traceback:", exc_info=True)
             return []
     
     def process_product(self, item_info: Dict[str, Any], parsed_products: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -84,37 +134,35 @@ class MyFastScraper:
             min_price = float(item_info.get("min_price", 0))
             max_price = float(item_info.get("max_price", float('inf')))
             
-            # Filter products that fall within the price range
-            filtered_products = []
-            for product in parsed_products:
-                try:
-                    product_price = float(product.get("price", 0))
-                    if min_price <= product_price <= max_price:
-                        filtered_products.append(product)
-                except (ValueError, TypeError) as e:
-                    self.logger.warning(f"⚠️ Invalid price format for product: {product.get('name', 'Unknown')}")
-                    continue
-            
-            # Sort by price closest to min_price (presumably looking for best deals)
-            if filtered_products:
-                sorted_products = sorted(
-                    filtered_products,
-                    key=lambda x: abs(float(x.get("price", 0)) - min_price)
-                )
+            # Vectorized filter: one price array, a range mask, then a partial
+            # sort for the two prices closest to min_price
+            prices = np.fromiter(
+                (_safe_float(str(product.get("price", 0))) for product in parsed_products),
+                dtype=np.float64,
+                count=len(parsed_products),
+            )
+            for i in np.flatnonzero(np.isnan(prices)):
+                self.logger.warning(f"⚠️ Invalid price format for product: {parsed_products[i].get('name', 'Unknown')}")
+
+            idx = np.flatnonzero((prices >= min_price) & (prices <= max_price))
+
+            if idx.size:
+                # Stable sort by distance so ties keep page order, as sorted() did
+                distances = np.abs(prices[idx] - min_price)
+                top = idx[np.argsort(distances, kind="stable")[:2]]
 
                 # Take top 2 matches, 2nd for backup
-                 
-                item_info["eligible_products"] = sorted_products[:2],
+                item_info["eligible_products"] = [parsed_products[i] for i in top]
 
             else:
                 self.logger.warning(f"⚠️ No eligible products found for {product_name}")
-                item_info["eligible_products"] = [],
+                item_info["eligible_products"] = []
             
             return item_info
             
         except Exception as e:
-            self.logger.error(f"❌ Error processing products for {item_info.get('product_name')}: {e}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.error("❌ Error processing products for %s: %s", item_info.get('product_name'), e)
+            self.logger.debug("Traceback:", exc_info=True)
             # Return the original item info but with empty eligible products
             item_info["eligible_products"] = []
             item_info["error"] = str(e)
@@ -128,39 +176,49 @@ class MyFastScraper:
             List of input items with eligible products attached
         """
         try:
-            # Process items in batches to avoid overwhelming the server
-            results = []
-            
-            # Process in batches
-            for i in range(0, len(self.input_items_info), self.batch_size):
-                batch = self.input_items_info[i:i+self.batch_size]
-                self.logger.info(f"Processing batch {i//self.batch_size + 1} ({len(batch)} items)")
-                
-                # Create scraping tasks for all items in this batch
-                scrape_tasks = []
-                for input_item_info in batch:
-                    query = input_item_info.get("product_name")
-                    scrape_tasks.append(self.scrape_products(query))
-                
-                # Execute all scraping tasks concurrently
-                scraped_products = await asyncio.gather(*scrape_tasks)
-                
-                # Process products for each item in the batch
-                for idx, input_item_info in enumerate(batch):
-                    # Process each product with its corresponding scraped data
-                    processed_item = self.process_product(input_item_info, scraped_products[idx])
-                    results.append(processed_item)
-                
-                # Pause briefly between batches to avoid overloading the server
-                if i + self.batch_size < len(self.input_items_info):
-                    await asyncio.sleep(random.randint(1, 3))  # Random sleep between 1 to 3 seconds
+            # Reuse one keep-alive session and one parser pool for the whole run
+            async with self:
+                total = len(self.input_items_info)
+                results: List[Optional[Dict[str, Any]]] = [None] * total
+                self.logger.info(f"Processing {total} items ({self.batch_size} in flight)")
+
+                # Producers scrape under a concurrency cap and a steady rate limit,
+                # the consumer processes each result as soon as it lands
+                queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.batch_size)
+                semaphore = asyncio.Semaphore(self.batch_size)
+                # By default keep the old pace: a full batch can start at once, about one batch per 2 s
+                if self.queries_per_second is None:
+                    limiter = AsyncLimiter(self.batch_size, 2)
+                else:
+                    limiter = AsyncLimiter(self.queries_per_second, 1)
+
+                async def produce(index: int, input_item_info: Dict[str, Any]) -> None:
+                    scraped_products: List[Dict[str, Any]] = []
+                    try:
+                        async with semaphore, limiter:
+                            scraped_products = await self.scrape_products(input_item_info.get("product_name"))
+                    finally:
+                        # Always report back so the consumer never waits on a lost item
+                        await queue.put((index, scraped_products))
+
+                producers = [
+                    asyncio.create_task(produce(index, input_item_info))
+                    for index, input_item_info in enumerate(self.input_items_info)
+                ]
+                try:
+                    for _ in range(total):
+                        index, scraped_products = await queue.get()
+                        results[index] = self.process_product(self.input_items_info[index], scraped_products)
+                finally:
+                    for task in producers:
+                        task.cancel()
             
             self.logger.info(f"✅ Successfully processed {len(results)} items")
             return results
             
         except Exception as e:
-            self.logger.error(f"❌ Error in get_eligible_products: {e}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.error("❌ Error in get_eligible_products: %s", e)
+            self.logger.debug("Traceback:", exc_info=True)
             return []
 
 if __name__ == "__main__":
@@ -174,6 +232,10 @@ if __name__ == "__main__":
     scraper = MyFastScraper(input_items[:2])
     
     # Run the scraper
-    results = asyncio.run(scraper.get_eligible_products())
+    async def run_scraper() -> List[Dict[str, Any]]:
+        async with scraper:
+            return await scraper.get_eligible_products()
+
+    results = asyncio.run(run_scraper())
 
     save_output_data(results)
\ No newline at end of file